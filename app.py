@@ -1,32 +1,69 @@
-import streamlit as st
-import pandas as pd
-import pydeck as pdk
-import altair as alt
-import os
+import time
+
+# Taken before the remaining imports so the startup profile includes them
+script_start = time.perf_counter()
+
+import streamlit as st  # noqa: E402
+import pandas as pd  # noqa: E402
+import altair as alt  # noqa: E402
+import os  # noqa: E402
+
+from radio_index import (  # noqa: E402
+    RADIO_COL_CELL,
+    SAMPLES_COL_BSSID,
+    build_radio_index,
+    samples_served_by,
+)
+from gate_store import (  # noqa: E402
+    bwi_airport_center,
+    load_gate_store,
+    rollup_landmark_aggregates,
+)
+from result_cache import derive_key, make_filter_key, result_cache  # noqa: E402
+from startup_profile import StartupTimer  # noqa: E402
+from trend_store import (  # noqa: E402
+    TREND_FREQS,
+    bucket_samples,
+    load_trend_store,
+    query_trend,
+    trend_store_path,
+)
 
 SAMPLES_COL_DATASET = "dataset"
 SAMPLES_COL_DEVICE_TYPE = "Device/OS"
 SAMPLES_COL_LANDMARK = "Gate / Landmark"
-GATES_COL_GATE = "gate"
 GATES_COL_LAT = "lat"
 GATES_COL_LNG = "lng"
 
-# Always use this as the airport center
-bwi_airport_center = [39.179459, -76.668473]
-
 # Paths
 data_dir = os.path.join(os.path.dirname(__file__), "data")
-gates_path = os.path.join(data_dir, "gates.csv")
 samples_path = os.path.join(
     data_dir,
     "2026_01_21_samples_combined.csv",
     # "samples_combined_jittered.csv"
 )
 
-# Read data
-gates_df = pd.read_csv(gates_path)
-samples_df = pd.read_csv(samples_path)
-dataset_options = sorted(samples_df[SAMPLES_COL_DATASET].dropna().unique().tolist())
+startup_timer = StartupTimer(script_start)
+startup_timer.mark("script_imports_done")
+
+
+# Loaded once per process and shared by all sessions; do not mutate
+@st.cache_resource(show_spinner="Loading samples...")
+def load_samples():
+    samples_df = pd.read_csv(samples_path)
+    # Keys results in result_cache to the data they were computed from
+    samples_df.attrs["data_version"] = os.path.getmtime(samples_path)
+    return samples_df
+
+
+@st.cache_resource(show_spinner=False)
+def get_gate_store():
+    return load_gate_store()
+
+
+@st.cache_resource(show_spinner="Indexing cells and access points...")
+def get_radio_index():
+    return build_radio_index(load_samples())
 
 
 def get_metric_description(field_name: str) -> str:
@@ -54,15 +91,68 @@ def get_metric_description(field_name: str) -> str:
     return ""
 
 
+def get_landmark_means(filtered_df, filter_key, metric_col):
+    return result_cache.get_or_compute(
+        derive_key(filter_key, metric_col, "landmark_mean"),
+        lambda: filtered_df.groupby(SAMPLES_COL_LANDMARK)[metric_col]
+        .mean()
+        .reset_index(),
+    )
+
+
+def get_trend_data_version():
+    # The trend store is read from its own file, with the loaded samples as
+    # fallback, so results depend on both
+    trend_mtime = (
+        os.path.getmtime(trend_store_path) if os.path.exists(trend_store_path) else None
+    )
+    return (samples_df.attrs["data_version"], trend_mtime)
+
+
+def get_trend_store():
+    # Prefer the store maintained by data/combine_samples.py; fall back to
+    # bucketing the loaded samples when it has not been built yet.
+    def build():
+        store = load_trend_store()
+        if store.empty:
+            store = bucket_samples(samples_df)
+        store["concourse"] = (
+            store[SAMPLES_COL_LANDMARK]
+            .astype(str)
+            .str.strip()
+            .map(gate_store["gate_index"])
+            .map(
+                lambda idx: gate_store["concourse"][int(idx)] if pd.notna(idx) else None
+            )
+        )
+        return store
+
+    return result_cache.get_or_compute(
+        make_filter_key(
+            comparison_id="trend_store",
+            data_version=get_trend_data_version(),
+        ),
+        build,
+    )
+
+
 st.set_page_config(layout="wide")
 
 st.title("BWI Analysis App")
+startup_timer.mark("page_shell_queued")
+
+# Read data after the page shell so it renders while samples load
+gate_store = get_gate_store()
+samples_df = load_samples()
+dataset_options = sorted(samples_df[SAMPLES_COL_DATASET].dropna().unique().tolist())
+startup_timer.mark("data_loaded")
 
 num_comparisons = st.select_slider("Comparisons", options=[1, 2, 3], value=1)
 
 FILTER_COLS = st.columns(num_comparisons)
 
 filtered_dfs = []
+filter_keys = []
 for i, col in enumerate(FILTER_COLS):
     with col:
         st.subheader("Filter Samples")
@@ -74,12 +164,21 @@ for i, col in enumerate(FILTER_COLS):
             default=dataset_options[:],
             key=f"dataset_select_{i}",
         )
-        # Subset DataFrame
-        filtered_df = samples_df[
-            samples_df[SAMPLES_COL_DATASET].isin(selected_datasets)
-        ]
-        device_type_options = sorted(
-            filtered_df[SAMPLES_COL_DEVICE_TYPE].dropna().unique().tolist()
+        # Device options only depend on the dataset selection
+        device_type_options = result_cache.get_or_compute(
+            make_filter_key(
+                selected_datasets,
+                comparison_id="device_options",
+                data_version=samples_df.attrs["data_version"],
+            ),
+            lambda: sorted(
+                samples_df[samples_df[SAMPLES_COL_DATASET].isin(selected_datasets)][
+                    SAMPLES_COL_DEVICE_TYPE
+                ]
+                .dropna()
+                .unique()
+                .tolist()
+            ),
         )
 
         selected_device_types = st.multiselect(
@@ -89,25 +188,41 @@ for i, col in enumerate(FILTER_COLS):
             key=f"device_type_select_{i}",
         )
 
-        # Subset DataFrame again based on selected device types
-        filtered_df = filtered_df[
-            filtered_df[SAMPLES_COL_DEVICE_TYPE].isin(selected_device_types)
-        ]
+        # Subset DataFrame on selected datasets and device types
+        filter_key = make_filter_key(
+            selected_datasets,
+            selected_device_types,
+            data_version=samples_df.attrs["data_version"],
+        )
+        filtered_df = result_cache.get_or_compute(
+            filter_key,
+            lambda: samples_df[
+                samples_df[SAMPLES_COL_DATASET].isin(selected_datasets)
+                & samples_df[SAMPLES_COL_DEVICE_TYPE].isin(selected_device_types)
+            ],
+        )
 
         with st.expander("See included samples"):
             st.dataframe(filtered_df, width="stretch")
 
         filtered_dfs.append(filtered_df)
+        filter_keys.append(filter_key)
 
 stats_cols = st.columns(num_comparisons)
-for col, filtered_df in zip(stats_cols, filtered_dfs):
+for col, filtered_df, filter_key in zip(stats_cols, filtered_dfs, filter_keys):
     with col:
         if filtered_df.empty:
             st.warning("No data available for the selected filters.")
             continue
 
         with st.expander("See Filtered Summary Stats"):
-            st.dataframe(filtered_df.describe(), width="stretch")
+            st.dataframe(
+                result_cache.get_or_compute(
+                    derive_key(filter_key, comparison_id="describe"),
+                    filtered_df.describe,
+                ),
+                width="stretch",
+            )
 
 
 selected_metric_cols = []
@@ -138,14 +253,14 @@ for i, (col, filtered_df) in enumerate(zip(metric_viz_headers, filtered_dfs)):
 
 
 plot_cols = st.columns(num_comparisons)
-for col, metric_col, filtered_df in zip(plot_cols, selected_metric_cols, filtered_dfs):
+for col, metric_col, filtered_df, filter_key in zip(
+    plot_cols, selected_metric_cols, filtered_dfs, filter_keys
+):
     if filtered_df.empty:
         continue
     with col:
         # --- Group by location and average selected metric ---
-        grouped = (
-            filtered_df.groupby(SAMPLES_COL_LANDMARK)[metric_col].mean().reset_index()
-        )
+        grouped = get_landmark_means(filtered_df, filter_key, metric_col)
         st.subheader(f"Average {metric_col} per Landmark")
         bar_chart = (
             alt.Chart(grouped)
@@ -175,27 +290,46 @@ for col, metric_col, filtered_df in zip(plot_cols, selected_metric_cols, filtere
         else:
             st.info("No data to display histogram.")
 
-for col, metric_col, filtered_df in zip(plot_cols, selected_metric_cols, filtered_dfs):
+        landmark_stats = result_cache.get_or_compute(
+            derive_key(filter_key, metric_col, "landmark_sum_count"),
+            lambda: filtered_df.groupby(
+                filtered_df[SAMPLES_COL_LANDMARK].astype(str).str.strip()
+            )[metric_col].agg(["sum", "count"]),
+        )
+        with st.expander(f"See {metric_col} per Concourse / Level"):
+            for level_name in ["concourse", "level"]:
+                st.dataframe(
+                    result_cache.get_or_compute(
+                        derive_key(filter_key, metric_col, f"{level_name}_rollup"),
+                        lambda: rollup_landmark_aggregates(
+                            gate_store,
+                            landmark_stats["sum"],
+                            landmark_stats["count"],
+                            by=level_name,
+                        ),
+                    ),
+                    width="stretch",
+                )
+
+for col, metric_col, filtered_df, filter_key in zip(
+    plot_cols, selected_metric_cols, filtered_dfs, filter_keys
+):
     if filtered_df.empty:
         continue
     with col:
-        grouped = (
-            filtered_df.groupby(SAMPLES_COL_LANDMARK)[metric_col].mean().reset_index()
-        )
+        # Copy: the cached frame is shared across sessions
+        grouped = get_landmark_means(filtered_df, filter_key, metric_col).copy()
         st.subheader(f"Average {metric_col} per Landmark")
-        # Join grouped averages to gates.csv lat/lng
-
+        # Look up grouped averages' lat/lng in the gate store
         grouped[SAMPLES_COL_LANDMARK] = (
             grouped[SAMPLES_COL_LANDMARK].astype(str).str.strip()
         )
-        gates_df[GATES_COL_GATE] = gates_df[GATES_COL_GATE].astype(str).str.strip()
-        merged = pd.merge(
-            grouped,
-            gates_df,
-            left_on=SAMPLES_COL_LANDMARK,
-            right_on=GATES_COL_GATE,
-            how="left",
-        )
+        gate_ids = grouped[SAMPLES_COL_LANDMARK].map(gate_store["gate_index"])
+        merged = grouped.copy()
+        for coord_col in [GATES_COL_LAT, GATES_COL_LNG]:
+            merged[coord_col] = gate_ids.map(
+                lambda idx: gate_store[coord_col][int(idx)] if pd.notna(idx) else None
+            )
         if GATES_COL_LAT in merged.columns and GATES_COL_LNG in merged.columns:
             map_df = merged.dropna(subset=[GATES_COL_LAT, GATES_COL_LNG, metric_col])
             map_df[GATES_COL_LAT] = pd.to_numeric(
@@ -246,6 +380,9 @@ for col, metric_col, filtered_df in zip(plot_cols, selected_metric_cols, filtere
                 </div>
                 """
             st.markdown(legend_html, unsafe_allow_html=True)
+            # Deferred: pydeck is only needed once a map renders
+            import pydeck as pdk
+
             st.pydeck_chart(
                 pdk.Deck(
                     map_style="light",
@@ -274,4 +411,135 @@ for col, metric_col, filtered_df in zip(plot_cols, selected_metric_cols, filtere
                 )
             )
         else:
-            st.info("No lat/lng columns found in gates.csv for mapping.")
+            st.info("No lat/lng columns found in the gate store for mapping.")
+
+trend_cols = st.columns(num_comparisons)
+for i, (col, metric_col, filtered_df, filter_key) in enumerate(
+    zip(trend_cols, selected_metric_cols, filtered_dfs, filter_keys)
+):
+    if filtered_df.empty:
+        continue
+    with col:
+        st.subheader(f"{metric_col} Trend")
+        granularity = st.selectbox(
+            "Bucket size:", list(TREND_FREQS.keys()), index=1, key=f"trend_freq_{i}"
+        )
+        group_label = st.radio(
+            "Group by:",
+            ["Landmark", "Concourse"],
+            horizontal=True,
+            key=f"trend_group_{i}",
+        )
+        group_col = SAMPLES_COL_LANDMARK if group_label == "Landmark" else "concourse"
+        selected_datasets, selected_device_types = filter_key[:2]
+        trend = result_cache.get_or_compute(
+            make_filter_key(
+                selected_datasets,
+                selected_device_types,
+                metric=metric_col,
+                comparison_id=f"trend_{granularity}_{group_col}",
+                data_version=get_trend_data_version(),
+            ),
+            lambda: query_trend(
+                get_trend_store(),
+                metric_col,
+                freq=TREND_FREQS[granularity],
+                group_col=group_col,
+                datasets=list(selected_datasets),
+                devices=list(selected_device_types),
+            ),
+        )
+        if trend.empty:
+            st.info("No timestamped samples for the selected filters.")
+            continue
+        trend_chart = (
+            alt.Chart(trend)
+            .mark_line(point=True)
+            .encode(
+                x=alt.X("bucket:T", title="Time"),
+                y=alt.Y("mean:Q", title=f"Avg {metric_col}"),
+                color=alt.Color(f"{group_col}:N", title=group_label),
+                tooltip=[
+                    alt.Tooltip("bucket:T", title="Time"),
+                    alt.Tooltip(f"{group_col}:N", title=group_label),
+                    alt.Tooltip("mean:Q", title=f"Avg {metric_col}", format=".2f"),
+                    alt.Tooltip("count:Q", title="Samples"),
+                ],
+            )
+            .properties(width=400, height=350)
+        )
+        st.altair_chart(trend_chart, width="stretch")
+
+radio_cols = st.columns(num_comparisons)
+for i, (col, filtered_df, filter_key) in enumerate(
+    zip(radio_cols, filtered_dfs, filter_keys)
+):
+    if filtered_df.empty:
+        continue
+    with col:
+        st.subheader("Cell / AP Analytics")
+        radio_index = get_radio_index()
+        radio_label = st.radio(
+            "Group by:",
+            ["Access Point (BSSID)", "Serving Cell (MCC-MNC-TAC-CID)"],
+            horizontal=True,
+            key=f"radio_group_{i}",
+        )
+        if radio_label.startswith("Access Point"):
+            id_col, stats, signal_col = (
+                SAMPLES_COL_BSSID,
+                radio_index["ap_stats"],
+                "RSSI",
+            )
+        else:
+            id_col, stats, signal_col = (
+                RADIO_COL_CELL,
+                radio_index["cell_stats"],
+                "RSRP",
+            )
+        if stats.empty:
+            st.info("No samples carry this identifier.")
+            continue
+
+        with st.expander("See per-identifier summary (all samples)"):
+            st.dataframe(stats, width="stretch")
+
+        selected_id = st.selectbox(
+            "Show everything served by:", stats.index.tolist(), key=f"radio_id_{i}"
+        )
+        # Index lookup, then apply this comparison's filters to just those rows
+        selected_datasets, selected_device_types = filter_key[:2]
+        served_df = samples_served_by(radio_index, samples_df, id_col, selected_id)
+        served_df = served_df[
+            served_df[SAMPLES_COL_DATASET].isin(selected_datasets)
+            & served_df[SAMPLES_COL_DEVICE_TYPE].isin(selected_device_types)
+        ]
+        if served_df.empty:
+            st.info(f"No filtered samples served by {selected_id}.")
+            continue
+        st.markdown(
+            "**Landmarks served:** "
+            + ", ".join(
+                sorted(served_df[SAMPLES_COL_LANDMARK].dropna().astype(str).unique())
+            )
+        )
+        if signal_col in served_df.columns and served_df[signal_col].notna().any():
+            signal_chart = (
+                alt.Chart(served_df.dropna(subset=[signal_col]))
+                .mark_boxplot()
+                .encode(
+                    x=alt.X(f"{SAMPLES_COL_LANDMARK}:N", title="Landmark"),
+                    y=alt.Y(f"{signal_col}:Q", title=signal_col),
+                )
+                .properties(width=400, height=300)
+            )
+            st.altair_chart(signal_chart, width="stretch")
+        with st.expander("See served samples"):
+            st.dataframe(served_df, width="stretch")
+
+startup_timer.mark("script_done")
+# Drawn last so the stats include this run's lookups
+with st.sidebar.expander("Result cache stats"):
+    st.json(result_cache.stats())
+with st.sidebar.expander("Startup profile"):
+    st.json(startup_timer.report())
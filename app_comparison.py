@@ -1,8 +1,15 @@
-import streamlit as st
-import pandas as pd
-import pydeck as pdk
-import altair as alt
-import os
+import time
+
+# Taken before the remaining imports so the startup profile includes them
+script_start = time.perf_counter()
+
+import streamlit as st  # noqa: E402
+import pandas as pd  # noqa: E402
+import altair as alt  # noqa: E402
+import os  # noqa: E402
+
+from result_cache import make_filter_key, result_cache  # noqa: E402
+from startup_profile import StartupTimer  # noqa: E402
 
 SAMPLES_COL_DATASET = "dataset"
 SAMPLES_COL_DEVICE_TYPE = "Device/OS"
@@ -22,19 +29,33 @@ bwi_airport_center = [39.179459, -76.668473]
 
 # Paths
 data_dir = os.path.join(os.path.dirname(__file__), "data")
-gates_path = os.path.join(data_dir, "gates.csv")
 samples_path = os.path.join(
     data_dir,
     "2026_01_21_samples_combined.csv",
     # "samples_combined_jittered.csv"
 )
 
-gates_df = pd.read_csv(gates_path)
-samples_df = pd.read_csv(samples_path)
+startup_timer = StartupTimer(script_start)
+startup_timer.mark("script_imports_done")
+
+
+# Loaded once per process and shared by all sessions; do not mutate
+@st.cache_resource(show_spinner="Loading samples...")
+def load_samples():
+    samples_df = pd.read_csv(samples_path)
+    # Keys results in result_cache to the data they were computed from
+    samples_df.attrs["data_version"] = os.path.getmtime(samples_path)
+    return samples_df
+
 
 st.set_page_config(layout="wide")
 
 st.title("BWI Analysis App")
+startup_timer.mark("page_shell_queued")
+
+# Read data after the page shell so it renders while samples load
+samples_df = load_samples()
+startup_timer.mark("data_loaded")
 
 
 def render_comparison_1():
@@ -59,16 +80,28 @@ def render_comparison_1():
 
     # Download Speed (Mbps)
 
-    df = samples_df[samples_df[SAMPLES_COL_DATASET] == dataset]
-    # Combined grouped bar chart: Wi-Fi and Cellular Download Speeds by Landmark
-    dl_melted = df.melt(
-        id_vars=[SAMPLES_COL_LANDMARK],
-        value_vars=[col_wifi, col_cell],
-        var_name="Network",
-        value_name=metric,
-    )
-    dl_melted["Network"] = dl_melted["Network"].map(
-        {col_wifi: "Wi-Fi", col_cell: "Cellular"}
+    def build_melted():
+        df = samples_df[samples_df[SAMPLES_COL_DATASET] == dataset]
+        # Combined grouped bar chart: Wi-Fi and Cellular Download Speeds by Landmark
+        dl_melted = df.melt(
+            id_vars=[SAMPLES_COL_LANDMARK],
+            value_vars=[col_wifi, col_cell],
+            var_name="Network",
+            value_name=metric,
+        )
+        dl_melted["Network"] = dl_melted["Network"].map(
+            {col_wifi: "Wi-Fi", col_cell: "Cellular"}
+        )
+        return dl_melted
+
+    dl_melted = result_cache.get_or_compute(
+        make_filter_key(
+            [dataset],
+            metric=metric,
+            comparison_id="comparison_1",
+            data_version=samples_df.attrs["data_version"],
+        ),
+        build_melted,
     )
 
     # Chart: Average Download Speed by Network Type (Wi-Fi vs Cellular, all landmarks)
@@ -163,25 +196,36 @@ def render_comparison_2():
     )
 
     # --- Build comparison dataframe ------------------------------------
-    frames = []
-
-    for cohort_name, cfg in cohorts.items():
-        metric_col = metric_map[title][cohort_name]
-
-        df_cohort = (
-            samples_df[samples_df[SAMPLES_COL_DATASET] == cfg["dataset"]][
-                [
-                    SAMPLES_COL_LANDMARK,
-                    metric_col,
+    def build_comparison_df():
+        frames = []
+
+        for cohort_name, cfg in cohorts.items():
+            metric_col = metric_map[title][cohort_name]
+
+            df_cohort = (
+                samples_df[samples_df[SAMPLES_COL_DATASET] == cfg["dataset"]][
+                    [
+                        SAMPLES_COL_LANDMARK,
+                        metric_col,
+                    ]
                 ]
-            ]
-            .rename(columns={metric_col: "value"})
-            .assign(cohort=cohort_name)
-        )
-
-        frames.append(df_cohort)
-
-    df = pd.concat(frames, ignore_index=True)
+                .rename(columns={metric_col: "value"})
+                .assign(cohort=cohort_name)
+            )
+
+            frames.append(df_cohort)
+
+        return pd.concat(frames, ignore_index=True)
+
+    df = result_cache.get_or_compute(
+        make_filter_key(
+            [cfg["dataset"] for cfg in cohorts.values()],
+            metric=title,
+            comparison_id="comparison_2",
+            data_version=samples_df.attrs["data_version"],
+        ),
+        build_comparison_df,
+    )
 
     # --- Average comparison --------------------------------------------
     avg_chart = (
@@ -245,28 +289,40 @@ def render_comparison_3():
     )
 
     metric_col = metric_cols[title]
-    df = samples_df[samples_df[SAMPLES_COL_DATASET].isin(datasets)][
-        [
-            SAMPLES_COL_LANDMARK,
-            SAMPLES_COL_DATASET,
-            metric_col,
-        ]
-    ].dropna(subset=[metric_col])
-
     SAMPLES_COL_CONFIG = "Config"
-    df[SAMPLES_COL_CONFIG] = df[SAMPLES_COL_DATASET].map(
-        {"B Concourse-iOS-14": "PP On", "B Concourse-iOS-14-PPoff": "PP Off"}
-    )
 
-    # Limit to landmarks that have both configs
-    valid_landmarks = (
-        df.groupby(SAMPLES_COL_LANDMARK)[SAMPLES_COL_CONFIG]
-        .nunique()
-        .loc[lambda s: s == 2]
-        .index
-    )
+    def build_config_df():
+        df = samples_df[samples_df[SAMPLES_COL_DATASET].isin(datasets)][
+            [
+                SAMPLES_COL_LANDMARK,
+                SAMPLES_COL_DATASET,
+                metric_col,
+            ]
+        ].dropna(subset=[metric_col])
+        df[SAMPLES_COL_CONFIG] = df[SAMPLES_COL_DATASET].map(
+            {"B Concourse-iOS-14": "PP On", "B Concourse-iOS-14-PPoff": "PP Off"}
+        )
 
-    df = df[df[SAMPLES_COL_LANDMARK].isin(valid_landmarks)]
+        # Limit to landmarks that have both configs
+        valid_landmarks = (
+            df.groupby(SAMPLES_COL_LANDMARK)[SAMPLES_COL_CONFIG]
+            .nunique()
+            .loc[lambda s: s == 2]
+            .index
+        )
+
+        df = df[df[SAMPLES_COL_LANDMARK].isin(valid_landmarks)]
+        return df
+
+    df = result_cache.get_or_compute(
+        make_filter_key(
+            datasets,
+            metric=title,
+            comparison_id="comparison_3",
+            data_version=samples_df.attrs["data_version"],
+        ),
+        build_config_df,
+    )
 
     avg_chart = (
         alt.Chart(df.groupby(SAMPLES_COL_CONFIG, as_index=False)[metric_col].mean())
@@ -328,3 +384,10 @@ def render_comparison_3():
 render_comparison_1()
 render_comparison_2()
 render_comparison_3()
+
+startup_timer.mark("script_done")
+# Drawn last so the stats include this run's lookups
+with st.sidebar.expander("Result cache stats"):
+    st.json(result_cache.stats())
+with st.sidebar.expander("Startup profile"):
+    st.json(startup_timer.report())
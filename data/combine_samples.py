@@ -1,6 +1,20 @@
 import pandas as pd
 import os
 import glob
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gate_store import file_sha256  # noqa: E402
+from trend_store import (  # noqa: E402
+    changed_datasets,
+    drop_datasets,
+    ingest_samples,
+    load_trend_sources,
+    load_trend_store,
+    save_trend_sources,
+    save_trend_store,
+    trend_store_path,
+)
 
 # samples_dir = os.path.join(os.path.dirname(__file__), "mock-samples")
 samples_dir = os.path.join(os.path.dirname(__file__), "samples")
@@ -30,10 +44,13 @@ def parse_csv(csv_path):
 # Parse all files and collect all unique columns
 dfs = []
 all_columns = set()
+file_hashes = {}
 for csv_path in glob.glob(os.path.join(samples_dir, "*.csv")):
     df = parse_csv(csv_path)
     dfs.append(df)
     all_columns.update(df.columns)
+    dataset = os.path.splitext(os.path.basename(csv_path))[0]
+    file_hashes[dataset] = file_sha256(csv_path)
 
 # Ensure all DataFrames have the same columns (fill missing with NaN)
 all_columns = list(all_columns)
@@ -51,3 +68,29 @@ combined["Gate / Landmark"] = combined["Gate / Landmark"].map(
 
 combined.to_csv(out_path, index=False)
 print(f"Combined CSV written to {out_path}")
+
+# Fold only new or changed survey files into the time-bucketed trend store.
+# Recorded hashes are only trusted while the bucket file they describe exists.
+trend_store = load_trend_store()
+trend_sources = load_trend_sources() if os.path.exists(trend_store_path) else {}
+to_ingest = changed_datasets(trend_sources, file_hashes)
+# Drop datasets whose survey file has been deleted
+removed = sorted(
+    (set(trend_sources) | set(trend_store[SAMPLES_COL_DATASET].dropna()))
+    - set(file_hashes)
+)
+if to_ingest or removed or not os.path.exists(trend_store_path):
+    trend_store = drop_datasets(trend_store, removed)
+    trend_store = ingest_samples(
+        trend_store, combined[combined[SAMPLES_COL_DATASET].isin(to_ingest)]
+    )
+    save_trend_store(trend_store)
+    trend_sources = {
+        dataset: sha for dataset, sha in trend_sources.items() if dataset in file_hashes
+    }
+    trend_sources.update({dataset: file_hashes[dataset] for dataset in to_ingest})
+    save_trend_sources(trend_sources)
+print(
+    f"Trend store: bucketed {len(to_ingest)} new or changed and dropped "
+    f"{len(removed)} deleted survey file(s)"
+)
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import math
+import os
+import pickle
+import tempfile
+
+import pandas as pd
+
+# Always use this as the airport center
+bwi_airport_center = [39.179459, -76.668473]
+
+EARTH_RADIUS_M = 6_371_008.8
+GATE_STORE_VERSION = 2
+
+# Paths
+data_dir = os.path.join(os.path.dirname(__file__), "data")
+geojson_path = os.path.join(data_dir, "gates.geojson")
+gate_store_path = os.path.join(data_dir, "gates_store.pkl")
+
+
+def project_local(lat: float, lng: float, center=bwi_airport_center):
+    """Project lat/lng to local (x, y) meters east/north of `center`.
+
+    Equirectangular approximation, accurate to well under a meter at
+    airport scale.
+    """
+    lat0, lng0 = center
+    x = math.radians(lng - lng0) * math.cos(math.radians(lat0)) * EARTH_RADIUS_M
+    y = math.radians(lat - lat0) * EARTH_RADIUS_M
+    return x, y
+
+
+def file_sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def build_gate_store(path: str = geojson_path, center=bwi_airport_center) -> dict:
+    """Build the gate geometry store from a gates GeoJSON file.
+
+    Per-gate attributes are held as parallel lists indexed by gate id, with
+    `gate_index` mapping gate name -> id and `hierarchy` mapping
+    concourse -> gate -> level. `source_sha256` records the GeoJSON the
+    store was built from.
+    """
+    with open(path, "r") as geojson_file:
+        data = json.load(geojson_file)
+
+    store = {
+        "version": GATE_STORE_VERSION,
+        "source_sha256": file_sha256(path),
+        "center": list(center),
+        "gate": [],
+        "concourse": [],
+        "level": [],
+        "lat": [],
+        "lng": [],
+        "x": [],
+        "y": [],
+        "gate_index": {},
+        "hierarchy": {},
+    }
+    for feature in data["features"]:
+        props = feature["properties"]
+        lng, lat = feature["geometry"]["coordinates"][:2]
+        gate = str(props.get("gate", "")).strip()
+        concourse = props.get("concourse", "")
+        level = props.get("level", "")
+        x, y = project_local(lat, lng, center)
+
+        store["gate_index"][gate] = len(store["gate"])
+        store["gate"].append(gate)
+        store["concourse"].append(concourse)
+        store["level"].append(level)
+        store["lat"].append(lat)
+        store["lng"].append(lng)
+        store["x"].append(x)
+        store["y"].append(y)
+        store["hierarchy"].setdefault(concourse, {})[gate] = level
+
+    return store
+
+
+def save_gate_store(store: dict, path: str = gate_store_path) -> None:
+    """Write the store atomically, so concurrent readers never see a partial file."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(store, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_gate_store(
+    path: str = gate_store_path, source_path: str = geojson_path
+) -> dict:
+    """Load the serialized gate store.
+
+    The store is rebuilt from GeoJSON if it is missing or unreadable, was
+    written by an older store version, or was built from a different
+    `source_path`.
+    """
+    try:
+        with open(path, "rb") as f:
+            store = pickle.load(f)
+        if store.get("version") == GATE_STORE_VERSION and store.get(
+            "source_sha256"
+        ) == file_sha256(source_path):
+            return store
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError, AttributeError):
+        pass
+    store = build_gate_store(source_path)
+    save_gate_store(store, path)
+    return store
+
+
+def rollup_landmark_aggregates(
+    store: dict, sums: pd.Series, counts: pd.Series, by: str = "concourse"
+) -> pd.DataFrame:
+    """Roll per-landmark sum/count aggregates up to concourse or level totals.
+
+    `sums` and `counts` are indexed by landmark name; labels that are equal
+    after stripping whitespace are merged. Landmarks that are not known
+    gates are dropped. Returns a frame indexed by `by` with `sum`,
+    `count`, `mean` and `gates` columns, plus the `x`/`y` centroid (meters
+    from the airport center) of the gates that contributed.
+    """
+    if by not in ("concourse", "level"):
+        raise ValueError(f"Unsupported roll-up level: {by}")
+    sums = sums.groupby(lambda landmark: str(landmark).strip()).sum()
+    counts = counts.groupby(lambda landmark: str(landmark).strip()).sum()
+    gate_index = store["gate_index"]
+    totals = {}
+    for concourse, gates in store["hierarchy"].items():
+        for gate, level in gates.items():
+            if gate not in sums.index:
+                continue
+            idx = gate_index[gate]
+            # [sum, count, gates, x total, y total]
+            entry = totals.setdefault(
+                concourse if by == "concourse" else level, [0.0, 0, 0, 0.0, 0.0]
+            )
+            entry[0] += sums[gate]
+            entry[1] += counts.get(gate, 0)
+            entry[2] += 1
+            entry[3] += store["x"][idx]
+            entry[4] += store["y"][idx]
+
+    rolled = pd.DataFrame.from_dict(
+        totals, orient="index", columns=["sum", "count", "gates", "x", "y"]
+    ).rename_axis(by)
+    rolled["mean"] = rolled["sum"] / rolled["count"].where(rolled["count"] > 0)
+    rolled["x"] = rolled["x"] / rolled["gates"]
+    rolled["y"] = rolled["y"] / rolled["gates"]
+    return rolled[["sum", "count", "mean", "gates", "x", "y"]].sort_index()
+
+
+if __name__ == "__main__":
+    save_gate_store(build_gate_store())
+    print(f"Gate store written to {gate_store_path}")
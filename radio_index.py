@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+SAMPLES_COL_LANDMARK = "Gate / Landmark"
+SAMPLES_COL_BSSID = "BSSID"
+RADIO_ID_COLS = [
+    "MCC",
+    "MNC",
+    "TAC",
+    "CID",
+    "PCI",
+    "EARFCN",
+    "SSID",
+    "BSSID",
+    "Band",
+    "Channel",
+]
+# Composite serving-cell key: MCC-MNC-TAC-CID
+CELL_ID_COLS = ["MCC", "MNC", "TAC", "CID"]
+RADIO_COL_CELL = "cell"
+AP_METRIC_COLS = ["RSSI", "Wi-Fi Ookla DL", "Wi-Fi Ookla UL", "Wi-Fi Ookla RTT"]
+CELL_METRIC_COLS = [
+    "RSRP",
+    "RSRQ",
+    "Cellular Ookla DL",
+    "Cellular Ookla UL",
+    "Cellular Ookla RTT",
+]
+METRIC_STATS = ["count", "mean", "min", "median", "max"]
+
+
+def normalize_id(value, col: str = None):
+    """Canonical string form of a radio identifier, or None if missing.
+
+    CSV round trips turn integer ids into floats (19648.0), so those are
+    written as integers. BSSID case varies by device, so BSSIDs (and only
+    BSSIDs) are uppercased.
+    """
+    if pd.isna(value):
+        return None
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    value = str(value).strip()
+    if not value:
+        return None
+    return value.upper() if col == SAMPLES_COL_BSSID else value
+
+
+def normalized_ids(samples_df: pd.DataFrame) -> pd.DataFrame:
+    """Normalized identifier columns, plus the composite cell key."""
+    ids = pd.DataFrame(index=samples_df.index)
+    for col in RADIO_ID_COLS:
+        if col in samples_df.columns:
+            ids[col] = (
+                samples_df[col].map(lambda v: normalize_id(v, col)).astype(object)
+            )
+    if all(col in ids.columns for col in CELL_ID_COLS):
+        # Concatenation propagates NaN, so a missing part leaves no cell key
+        cell = ids[CELL_ID_COLS[0]]
+        for col in CELL_ID_COLS[1:]:
+            cell = cell + "-" + ids[col]
+        ids[RADIO_COL_CELL] = cell.astype(object)
+    return ids
+
+
+def aggregate_metrics(
+    samples_df: pd.DataFrame, keys: pd.Series, metric_cols
+) -> pd.DataFrame:
+    """Per-identifier metric distributions and the landmarks each one serves."""
+    metric_cols = [c for c in metric_cols if c in samples_df.columns]
+    df = (
+        samples_df[metric_cols + [SAMPLES_COL_LANDMARK]]
+        .assign(_key=keys)
+        .dropna(subset=["_key"])
+    )
+    if df.empty:
+        return pd.DataFrame()
+    grouped = df.groupby("_key")
+    stats = grouped[metric_cols].agg(METRIC_STATS)
+    stats.columns = [f"{metric} {stat}" for metric, stat in stats.columns]
+    stats.insert(0, "samples", grouped.size())
+    stats.insert(
+        1,
+        "landmarks",
+        grouped[SAMPLES_COL_LANDMARK].agg(
+            lambda s: ", ".join(sorted(s.dropna().astype(str).unique()))
+        ),
+    )
+    return stats.rename_axis(keys.name)
+
+
+def build_radio_index(samples_df: pd.DataFrame) -> dict:
+    """Inverted index from cell/AP identifiers to sample row positions.
+
+    `index[col][value]` is a sorted array of row positions into
+    `samples_df` for every identifier column plus the composite `cell`
+    key. `ap_stats` and `cell_stats` hold pre-aggregated metrics per BSSID
+    and per serving cell.
+    """
+    samples = samples_df.reset_index(drop=True)
+    ids = normalized_ids(samples)
+    index = {col: dict(ids.groupby(col, dropna=True).indices) for col in ids.columns}
+
+    def stats_for(col, metric_cols):
+        if col not in ids.columns:
+            return pd.DataFrame()
+        return aggregate_metrics(samples, ids[col], metric_cols)
+
+    return {
+        "index": index,
+        "ap_stats": stats_for(SAMPLES_COL_BSSID, AP_METRIC_COLS),
+        "cell_stats": stats_for(RADIO_COL_CELL, CELL_METRIC_COLS),
+    }
+
+
+def lookup_rows(radio_index: dict, col: str, value) -> np.ndarray:
+    """Row positions of samples whose `col` identifier equals `value`."""
+    return (
+        radio_index["index"]
+        .get(col, {})
+        .get(normalize_id(value, col), np.array([], dtype=np.intp))
+    )
+
+
+def samples_served_by(
+    radio_index: dict, samples_df: pd.DataFrame, col: str, value
+) -> pd.DataFrame:
+    """Every sample served by the given identifier, via index lookup."""
+    return samples_df.iloc[lookup_rows(radio_index, col, value)]
@@ -0,0 +1,134 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def make_filter_key(
+    datasets=(), devices=(), metric=None, comparison_id=None, data_version=None
+) -> tuple:
+    """Normalize filter state so equivalent selections share a cache entry.
+
+    `data_version` identifies the data the result is computed from (e.g. the
+    samples CSV mtime at load time, or a tuple of versions when a result
+    reads several files), so results computed from older data are never
+    served.
+    """
+    return (
+        tuple(sorted(str(d) for d in datasets)),
+        tuple(sorted(str(d) for d in devices)),
+        metric,
+        comparison_id,
+        data_version,
+    )
+
+
+def derive_key(key: tuple, metric=None, comparison_id=None) -> tuple:
+    """Key for a result derived from `key`'s filter state and data version."""
+    return key[:2] + (metric, comparison_id) + key[4:]
+
+
+def estimate_nbytes(value) -> int:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_nbytes(k) + estimate_nbytes(v) for k, v in value.items()
+        )
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """Thread-safe LRU cache bounded by estimated memory use.
+
+    Concurrent callers asking for the same key while it is being computed
+    wait for the first caller's result instead of recomputing it. Cached
+    values are shared between sessions and must not be mutated.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+        self._in_flight = {}  # key -> threading.Event
+        self._lock = threading.Lock()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._shared_waits = 0
+        self._evictions = 0
+        self._compute_seconds = 0.0
+
+    def get_or_compute(self, key, compute):
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return self._entries[key][0]
+                event = self._in_flight.get(key)
+                if event is None:
+                    event = threading.Event()
+                    self._in_flight[key] = event
+                    self._misses += 1
+                    break
+                self._shared_waits += 1
+            # Another session is computing this key; wait and re-check. If it
+            # failed or the result was too large to cache, we compute it next.
+            event.wait()
+
+        try:
+            start = time.perf_counter()
+            value = compute()
+            elapsed = time.perf_counter() - start
+            self._store(key, value, elapsed)
+            return value
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            event.set()
+
+    def _store(self, key, value, elapsed: float) -> None:
+        nbytes = estimate_nbytes(value)
+        with self._lock:
+            self._compute_seconds += elapsed
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (value, nbytes)
+            self._nbytes += nbytes
+            while self._nbytes > self.max_bytes:
+                _, (_, evicted_nbytes) = self._entries.popitem(last=False)
+                self._nbytes -= evicted_nbytes
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "shared_waits": self._shared_waits,
+                "evictions": self._evictions,
+                "in_flight": len(self._in_flight),
+                "compute_seconds": self._compute_seconds,
+            }
+
+
+# Process-wide cache shared by every Streamlit session. Modules imported by
+# the app scripts are not re-executed on rerun, so this outlives sessions.
+result_cache = ResultCache()
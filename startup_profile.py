@@ -0,0 +1,96 @@
+import os
+import re
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ["streamlit", "pandas", "numpy", "altair", "pydeck"]
+
+
+def process_start_perf_counter():
+    """`time.perf_counter()` value at process creation, or None if unknown.
+
+    Read from /proc (Linux only), to 1/CLK_TCK (usually 10 ms) resolution.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            stat = f.read()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+    except OSError:
+        return None
+    # Field 22 (starttime) counted from field 3, the first after "(comm)"
+    start_ticks = int(stat.rsplit(")", 1)[1].split()[19])
+    age = uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    return time.perf_counter() - age
+
+
+process_start = process_start_perf_counter()
+
+# Process-relative timings of the first script run, i.e. the cold start
+first_run_marks = {}
+
+
+class StartupTimer:
+    """Records milliseconds to named milestones of a script run.
+
+    Marks are measured from `start`, a `time.perf_counter()` reading taken
+    as the script's first statement, and from process creation where it is
+    known. `streamlit run` imports streamlit and starts its server before
+    running the script, so only process-relative marks cover that. Marks
+    record when a statement was reached, e.g. when elements were queued for
+    the browser, not when the browser painted them.
+    """
+
+    def __init__(self, start: float = None):
+        self.start = time.perf_counter() if start is None else start
+        self.marks = {}
+        self.process_marks = {}
+
+    def mark(self, name: str) -> None:
+        now = time.perf_counter()
+        self.marks[name] = (now - self.start) * 1000
+        if process_start is not None:
+            self.process_marks[name] = (now - process_start) * 1000
+            first_run_marks.setdefault(name, self.process_marks[name])
+
+    def report(self) -> dict:
+        return {
+            "since_script_start_ms": {k: round(v, 1) for k, v in self.marks.items()},
+            "since_process_start_ms": {
+                k: round(v, 1) for k, v in self.process_marks.items()
+            },
+            "cold_start_since_process_start_ms": {
+                k: round(v, 1) for k, v in first_run_marks.items()
+            },
+        }
+
+
+def measure_import_time(module: str) -> float:
+    """Cumulative import time of `module` in milliseconds, measured in a
+    fresh interpreter with `python -X importtime`. NaN if it fails to import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return float("nan")
+    # Lines look like: "import time:  self [us] | cumulative | imported package"
+    pattern = re.compile(r"import time:\s+\d+\s+\|\s+(\d+)\s+\|\s*(\S+)\s*$")
+    for line in reversed(result.stderr.splitlines()):
+        match = pattern.match(line)
+        if match and match.group(2) == module:
+            return int(match.group(1)) / 1000
+    return float("nan")
+
+
+def import_time_report(modules=HEAVY_MODULES) -> dict:
+    return {module: measure_import_time(module) for module in modules}
+
+
+if __name__ == "__main__":
+    for module, ms in sorted(
+        import_time_report().items(), key=lambda kv: kv[1], reverse=True
+    ):
+        print(f"{module:<12} {ms:>9.1f} ms")
@@ -0,0 +1,178 @@
+import json
+import os
+
+import pandas as pd
+
+SAMPLES_COL_TIME = "Time"
+SAMPLES_COL_DATASET = "dataset"
+SAMPLES_COL_DEVICE_TYPE = "Device/OS"
+SAMPLES_COL_LANDMARK = "Gate / Landmark"
+METRIC_KEYS = ["Ookla", "RSSI", "RSRP", "RSRQ"]
+
+TREND_COL_BUCKET = "bucket"
+TREND_COL_METRIC = "metric"
+TREND_COL_SUM = "sum"
+TREND_COL_COUNT = "count"
+TREND_KEY_COLS = [
+    TREND_COL_BUCKET,
+    SAMPLES_COL_DATASET,
+    SAMPLES_COL_LANDMARK,
+    SAMPLES_COL_DEVICE_TYPE,
+    TREND_COL_METRIC,
+]
+TREND_COLS = TREND_KEY_COLS + [TREND_COL_SUM, TREND_COL_COUNT]
+
+# Finest bucket kept in the store; coarser ones are rolled up at query time
+BASE_FREQ = "h"
+TREND_FREQS = {"Hourly": "h", "Daily": "D", "Weekly": "W", "Monthly": "MS"}
+
+# Paths
+data_dir = os.path.join(os.path.dirname(__file__), "data")
+trend_store_path = os.path.join(data_dir, "trend_buckets.csv")
+# Content hash of each survey file already bucketed, keyed by dataset name
+trend_sources_path = os.path.join(data_dir, "trend_buckets_sources.json")
+
+
+def empty_trend_store() -> pd.DataFrame:
+    return pd.DataFrame(columns=TREND_COLS)
+
+
+def bucket_samples(samples_df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate raw samples into hourly sum/count rows per
+    (dataset, landmark, device, metric). Samples without a parseable time
+    are skipped."""
+    if SAMPLES_COL_TIME not in samples_df.columns:
+        return empty_trend_store()
+    metric_cols = [
+        c for c in samples_df.columns if any(key in str(c) for key in METRIC_KEYS)
+    ]
+    df = samples_df.assign(
+        **{
+            TREND_COL_BUCKET: pd.to_datetime(
+                samples_df[SAMPLES_COL_TIME], errors="coerce"
+            ).dt.floor(BASE_FREQ)
+        }
+    ).dropna(subset=[TREND_COL_BUCKET])
+    if df.empty or not metric_cols:
+        return empty_trend_store()
+
+    id_cols = [
+        TREND_COL_BUCKET,
+        SAMPLES_COL_DATASET,
+        SAMPLES_COL_LANDMARK,
+        SAMPLES_COL_DEVICE_TYPE,
+    ]
+    long_df = df.melt(
+        id_vars=id_cols,
+        value_vars=metric_cols,
+        var_name=TREND_COL_METRIC,
+    )
+    long_df["value"] = pd.to_numeric(long_df["value"], errors="coerce")
+    long_df = long_df.dropna(subset=["value"])
+    return (
+        long_df.groupby(TREND_KEY_COLS, dropna=False)["value"]
+        .agg([TREND_COL_SUM, TREND_COL_COUNT])
+        .reset_index()
+    )
+
+
+def ingest_samples(store: pd.DataFrame, samples_df: pd.DataFrame) -> pd.DataFrame:
+    """Fold newly combined samples into the store.
+
+    Buckets for datasets present in `samples_df` are replaced rather than
+    added to, so re-combining a survey file does not double count it.
+    """
+    new_buckets = bucket_samples(samples_df)
+    datasets = samples_df[SAMPLES_COL_DATASET].dropna().unique()
+    kept = store[~store[SAMPLES_COL_DATASET].isin(datasets)]
+    if kept.empty:
+        return new_buckets.reset_index(drop=True)
+    if new_buckets.empty:
+        return kept.reset_index(drop=True)
+    return pd.concat([kept, new_buckets], ignore_index=True)
+
+
+def drop_datasets(store: pd.DataFrame, datasets) -> pd.DataFrame:
+    """Remove every bucket belonging to `datasets`."""
+    return store[~store[SAMPLES_COL_DATASET].isin(datasets)].reset_index(drop=True)
+
+
+def load_trend_store(path: str = trend_store_path) -> pd.DataFrame:
+    if not os.path.exists(path):
+        return empty_trend_store()
+    store = pd.read_csv(path, parse_dates=[TREND_COL_BUCKET])
+    return store[TREND_COLS]
+
+
+def save_trend_store(store: pd.DataFrame, path: str = trend_store_path) -> None:
+    store.to_csv(path, index=False)
+
+
+def load_trend_sources(path: str = trend_sources_path) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_trend_sources(sources: dict, path: str = trend_sources_path) -> None:
+    with open(path, "w") as f:
+        json.dump(sources, f, indent=2, sort_keys=True)
+
+
+def changed_datasets(sources: dict, file_hashes: dict) -> list:
+    """Datasets whose survey file is new or differs from when it was bucketed."""
+    return sorted(
+        dataset for dataset, sha in file_hashes.items() if sources.get(dataset) != sha
+    )
+
+
+def query_trend(
+    store: pd.DataFrame,
+    metric: str,
+    freq: str = "D",
+    group_col: str = SAMPLES_COL_LANDMARK,
+    datasets=None,
+    devices=None,
+    start=None,
+    end=None,
+) -> pd.DataFrame:
+    """Mean of `metric` per time bucket and `group_col`, read from the
+    pre-bucketed store.
+
+    `group_col` is a store column (e.g. landmark) or any column added to
+    `store` by the caller (e.g. concourse). Returns columns
+    [bucket, group_col, sum, count, mean].
+    """
+    mask = store[TREND_COL_METRIC] == metric
+    if datasets is not None:
+        mask &= store[SAMPLES_COL_DATASET].isin(datasets)
+    if devices is not None:
+        mask &= store[SAMPLES_COL_DEVICE_TYPE].isin(devices)
+    if start is not None:
+        mask &= store[TREND_COL_BUCKET] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= store[TREND_COL_BUCKET] < pd.Timestamp(end)
+    df = store[mask]
+    if df.empty:
+        return pd.DataFrame(
+            columns=[
+                TREND_COL_BUCKET,
+                group_col,
+                TREND_COL_SUM,
+                TREND_COL_COUNT,
+                "mean",
+            ]
+        )
+
+    # Sums and counts roll up exactly from hourly to any coarser bucket
+    trend = (
+        df.groupby(
+            [pd.Grouper(key=TREND_COL_BUCKET, freq=freq), group_col], dropna=True
+        )[[TREND_COL_SUM, TREND_COL_COUNT]]
+        .sum()
+        .reset_index()
+    )
+    trend = trend[trend[TREND_COL_COUNT] > 0]
+    trend["mean"] = trend[TREND_COL_SUM] / trend[TREND_COL_COUNT]
+    return trend